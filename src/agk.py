@@ -1,5 +1,9 @@
 import os
+import time
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from supabase import create_client
 from dotenv import load_dotenv
 
@@ -10,18 +14,71 @@ load_dotenv("config/.env")
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# Initialize Supabase client
+# Supabase client, created on first use so importing agk stays cheap
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
-def validate_access(user_id, supabase_client=supabase):
+@lru_cache(maxsize=1)
+def get_supabase():
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def __getattr__(name):
+    # Keep `agk.supabase` working for existing importers; resolves lazily
+    if name == "supabase":
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Short-lived LRU cache of granted access, so repeated checks for an allowed
+# user skip the database round-trip. Denials are never cached. A score lowered
+# by webhook_server only denies access once the cached grant expires, so keep
+# the TTL short; set AGK_ACCESS_CACHE_TTL_SECONDS=0 to disable caching.
+ACCESS_CACHE_TTL_SECONDS = max(0.0, float(os.getenv("AGK_ACCESS_CACHE_TTL_SECONDS", 30)))
+ACCESS_CACHE_MAX_SIZE = 10_000
+_access_cache = OrderedDict()  # user_id -> monotonic time access was granted
+_access_cache_lock = threading.Lock()
+
+
+def _has_cached_access(user_id):
+    with _access_cache_lock:
+        granted_at = _access_cache.get(user_id)
+        if granted_at is None:
+            return False
+        if time.monotonic() - granted_at > ACCESS_CACHE_TTL_SECONDS:
+            del _access_cache[user_id]
+            return False
+        _access_cache.move_to_end(user_id)
+        return True
+
+
+def _cache_access(user_id):
+    if ACCESS_CACHE_TTL_SECONDS <= 0:
+        return
+    with _access_cache_lock:
+        _access_cache[user_id] = time.monotonic()
+        _access_cache.move_to_end(user_id)
+        if len(_access_cache) > ACCESS_CACHE_MAX_SIZE:
+            _access_cache.popitem(last=False)
+
+
+def validate_access(user_id, supabase_client=None):
     """
     Validate access based on user behavior score and other token claims.
     Access denied if behavior_score < 60.
+    Grants made through the default client are cached for
+    ACCESS_CACHE_TTL_SECONDS (see README "Known Limitations"); denials and
+    calls with an explicit supabase_client always read through.
     """
     try:
+        use_cache = supabase_client is None
+        if use_cache and _has_cached_access(user_id):
+            logger.info(f"Access granted for user {user_id} (cached).")
+            return True
+
+        if supabase_client is None:
+            supabase_client = get_supabase()
         resp = supabase_client.table("users").select("behavior_score, role, is_anonymous").eq("id", user_id).single().execute()
         user = resp.data
         if not user:
@@ -40,6 +97,8 @@ def validate_access(user_id, supabase_client=supabase):
 
         # Add any other access policies based on role or is_anonymous if needed here
 
+        if use_cache:
+            _cache_access(user_id)
         logger.info(f"Access granted for user {user_id}.")
         return True
 
@@ -1,6 +1,8 @@
 import os
 import logging
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client
 from dotenv import load_dotenv
 
@@ -23,8 +25,13 @@ def fetch_analytics_data():
         dict: { "scores": [...], "flags": [...] }
     """
     try:
-        score_resp = supabase.table("users").select("id, behavior_score").execute()
-        flag_resp = supabase.table("user_risk_flags").select("user_id, flag, timestamp").execute()
+        # The two queries are independent; run them concurrently so the
+        # fetch costs one round-trip of wall time instead of two.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            score_future = pool.submit(supabase.table("users").select("id, behavior_score").execute)
+            flag_future = pool.submit(supabase.table("user_risk_flags").select("user_id, flag, timestamp").execute)
+            score_resp = score_future.result()
+            flag_resp = flag_future.result()
         return {
             "scores": score_resp.data or [],
             "flags": flag_resp.data or []
@@ -41,18 +48,32 @@ def prepare_chart_data(data):
     """
     Converts Supabase analytics data into chart-compatible dicts.
     """
-    scores = [entry["behavior_score"] for entry in data.get("scores", []) if "behavior_score" in entry]
-    score_counts = pd.Series(scores).value_counts().sort_index().to_dict()
+    # Keep numeric scores only (bool excluded); a stray string or null row
+    # is skipped rather than breaking the whole dashboard
+    scores = [
+        entry["behavior_score"] for entry in data.get("scores", [])
+        if isinstance(entry.get("behavior_score"), (int, float, np.number))
+        and not isinstance(entry.get("behavior_score"), bool)
+    ]
+    # Sorted unique scores and their counts in one C-level pass; np.asarray
+    # picks int64 for all-int scores and float64 once any float is present
+    values, counts = np.unique(np.asarray(scores), return_counts=True)
+    score_counts = dict(zip(values.tolist(), counts.tolist()))
 
     flag_data = pd.DataFrame(data.get("flags", []))
     flag_trends_json = {}
 
     if not flag_data.empty and "timestamp" in flag_data.columns:
-        flag_data["timestamp"] = pd.to_datetime(flag_data["timestamp"])
-        grouped = flag_data.groupby([pd.Grouper(key="timestamp", freq="D"), "flag"]).size().unstack(fill_value=0)
-        grouped = grouped.reset_index()  # Avoid IndexError for .to_dict()
-        flag_trends_json = grouped.to_dict(orient="list")
-    else:
+        # Parse every timestamp in one vectorized call; malformed values become
+        # NaT and are dropped instead of failing the whole chart.
+        flag_data["timestamp"] = pd.to_datetime(flag_data["timestamp"], errors="coerce", utc=True)
+        flag_data = flag_data.dropna(subset=["timestamp"])
+        if not flag_data.empty:
+            grouped = flag_data.groupby([pd.Grouper(key="timestamp", freq="D"), "flag"]).size().unstack(fill_value=0)
+            grouped = grouped.reset_index()  # Avoid IndexError for .to_dict()
+            flag_trends_json = grouped.to_dict(orient="list")
+
+    if not flag_trends_json:
         logger.info("No flag data to process.")
 
     return {
@@ -1,5 +1,10 @@
 import os
 import logging
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from supabase import create_client
 from dotenv import load_dotenv
@@ -11,6 +16,9 @@ load_dotenv("../config/.env")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_WORKERS = max(1, int(os.getenv("WEBHOOK_WORKERS", 16)))
+# Seconds to wait on the webhook so a hung endpoint cannot stall the send pool
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", 10))
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -19,34 +27,81 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 # Initialize Supabase client if needed for saving scores
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Shared HTTP session so webhook sends reuse pooled keep-alive connections
+webhook_session = requests.Session()
+webhook_session.mount("http://", HTTPAdapter(pool_maxsize=WEBHOOK_WORKERS))
+webhook_session.mount("https://", HTTPAdapter(pool_maxsize=WEBHOOK_WORKERS))
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Define known IPs for fake referral detection
-known_ips = ["192.168.1.1"]
+known_ips = frozenset({"192.168.1.1"})
 
-def calculate_score(payload):
-    score = 100
-    risk_flags = []
-    try:
-        md = payload.get("metadata", {})
-        evt = payload.get("event_type", "")
+# Risk flags in bit order: bit i of a flag mask stands for FLAG_NAMES[i]
+FLAG_NAMES = ("frequent_logins", "fake_referral", "rapid_clicks")
+FLAG_PENALTIES = (10, 20, 15)
+FLAG_BITS = {flag: 1 << i for i, flag in enumerate(FLAG_NAMES)}
+
+# Total penalty for every possible flag mask, so scoring is a single lookup
+MASK_PENALTIES = tuple(
+    sum(penalty for i, penalty in enumerate(FLAG_PENALTIES) if mask & (1 << i))
+    for mask in range(1 << len(FLAG_NAMES))
+)
+
+# Flag names for every possible flag mask, shared instead of rebuilt per call
+MASK_FLAGS = tuple(
+    tuple(flag for i, flag in enumerate(FLAG_NAMES) if mask & (1 << i))
+    for mask in range(1 << len(FLAG_NAMES))
+)
+
+# A scoring rule sets `bit` in the flag mask when predicate(metadata) holds
+Rule = namedtuple("Rule", "bit predicate")
 
-        if evt == "login" and md.get("login_count", 0) > 10:
-            score -= 10
-            risk_flags.append("frequent_logins")
+# Rules keyed by event type, so each call only evaluates rules that can apply
+RULES_BY_EVENT = {
+    "login": (
+        Rule(FLAG_BITS["frequent_logins"], lambda md: md.get("login_count", 0) > 10),
+    ),
+    "referral": (
+        Rule(FLAG_BITS["fake_referral"], lambda md: md.get("ip") in known_ips and not md.get("activity", True)),
+    ),
+    "click": (
+        Rule(FLAG_BITS["rapid_clicks"], lambda md: md.get("click_rate", 0) > 30),
+    ),
+}
 
-        if evt == "referral" and md.get("ip") in known_ips and not md.get("activity", True):
-            score -= 20
-            risk_flags.append("fake_referral")
+def flags_from_bits(flag_bits):
+    # Copy so callers keep getting a list and can't mutate the shared MASK_FLAGS entries
+    return list(MASK_FLAGS[flag_bits])
 
-        if evt == "click" and md.get("click_rate", 0) > 30:
-            score -= 15
-            risk_flags.append("rapid_clicks")
+def calculate_score_bits(payload):
+    """
+    Score a payload and return (score, flag_bits) without building a flag list.
+    Use flags_from_bits to turn flag_bits back into flag names.
+    """
+    flag_bits = 0
+    # Reject malformed payloads up front rather than via exceptions
+    if not isinstance(payload, dict):
+        return 100, flag_bits
+    md = payload.get("metadata", {})
+    rules = RULES_BY_EVENT.get(payload.get("event_type", ""))
+    # Nothing can match without metadata or rules for this event type
+    if not rules or not md or not isinstance(md, dict):
+        return 100, flag_bits
+
+    try:
+        for rule in rules:
+            if rule.predicate(md):
+                flag_bits |= rule.bit
 
     except Exception as e:
         logger.error(f"Exception in calculate_score: {e}")
-    return max(score, 0), risk_flags
+    return max(100 - MASK_PENALTIES[flag_bits], 0), flag_bits
+
+def calculate_score(payload):
+    score, flag_bits = calculate_score_bits(payload)
+    return score, flags_from_bits(flag_bits)
 
 def send_score_to_webhook(user_id, score, risk_flags):
-    import requests
     payload = {
         "user_id": user_id,
         "behavior_score": score,
@@ -54,13 +109,22 @@ def send_score_to_webhook(user_id, score, risk_flags):
         "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     }
     try:
-        response = requests.post(WEBHOOK_URL, json=payload)
+        response = webhook_session.post(WEBHOOK_URL, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=WEBHOOK_TIMEOUT)
         if response.status_code == 200:
             logger.info(f"Score sent to webhook for user {user_id}")
-        else:
-            logger.warning(f"Failed to send score for user {user_id}: {response.status_code} {response.text}")
+            return True
+        logger.warning(f"Failed to send score for user {user_id}: {response.status_code} {response.text}")
     except Exception as e:
         logger.error(f"Exception in send_score_to_webhook: {e}")
+    return False
+
+def send_scores_bulk(results):
+    """
+    Send many (user_id, score, risk_flags) results to the webhook concurrently.
+    Returns one success flag per result, in input order.
+    """
+    with ThreadPoolExecutor(max_workers=WEBHOOK_WORKERS) as pool:
+        return list(pool.map(lambda result: send_score_to_webhook(*result), results))
 
 if __name__ == "__main__":
     # Example/test payloads
@@ -100,7 +164,9 @@ if __name__ == "__main__":
         }
     ]
 
+    results = []
     for p in payloads:
         score, flags = calculate_score(p)
         logger.info(f"User {p['user_id']} scored {score} with flags {flags}")
-        send_score_to_webhook(p["user_id"], score, flags)
+        results.append((p["user_id"], score, flags))
+    send_scores_bulk(results)
@@ -1,6 +1,9 @@
 import os
+import heapq
+import itertools
 import logging
 import requests
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from supabase import create_client
@@ -15,6 +18,8 @@ REPLICATE_API = "https://api.replicate.com/v1/predictions"
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 MODEL_VERSION = os.getenv("REPLICATE_MODEL_VERSION")
+# At least one entry, otherwise every insert would be evicted immediately
+CACHE_MAX_SIZE = max(1, int(os.getenv("MEME_CACHE_MAX_SIZE", 1000)))
 
 # Setup logger
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -23,8 +28,11 @@ logger = logging.getLogger(__name__)
 # Initialize Supabase client
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# Simple in-memory cache for repeated meme requests within 24 hours
-MEME_CACHE = {}
+# In-memory LRU cache for repeated meme requests within 24 hours
+MEME_CACHE = OrderedDict()
+# Min-heap of (expiry, seq, key) so cleanup only visits entries that expired
+MEME_CACHE_EXPIRY_HEAP = []
+_cache_seq = itertools.count()
 
 def is_cache_valid(cache_entry):
     if not cache_entry:
@@ -35,17 +43,53 @@ def is_cache_valid(cache_entry):
 def get_cached_result(user_id, prompt, tone, image_url):
     key = (user_id, prompt, tone, image_url or "")
     entry = MEME_CACHE.get(key)
+    if entry is None:
+        # Plain miss: nothing to evict, skip the expiry check entirely
+        return None
     if is_cache_valid(entry):
         logger.info(f"Serving meme from cache for user={user_id}, prompt='{prompt}', tone={tone}")
+        MEME_CACHE.move_to_end(key)
         return entry[0]
-    else:
-        MEME_CACHE.pop(key, None)
-        return None
+    del MEME_CACHE[key]
+    return None
 
 def cache_result(user_id, prompt, tone, image_url, result, ttl_hours=24):
     key = (user_id, prompt, tone, image_url or "")
-    expiry = datetime.utcnow() + timedelta(hours=ttl_hours)
+    now = datetime.utcnow()
+    cleanup_cache(now)
+    expiry = now + timedelta(hours=ttl_hours)
     MEME_CACHE[key] = (result, expiry)
+    MEME_CACHE.move_to_end(key)
+    # Evict the least recently used entry once the cache is full
+    if len(MEME_CACHE) > CACHE_MAX_SIZE:
+        MEME_CACHE.popitem(last=False)
+    heapq.heappush(MEME_CACHE_EXPIRY_HEAP, (expiry, next(_cache_seq), key))
+    # Evicted and re-cached keys leave stale heap records behind; drop them
+    # once they outnumber the live entries so the heap stays O(CACHE_MAX_SIZE)
+    if len(MEME_CACHE_EXPIRY_HEAP) > 2 * CACHE_MAX_SIZE:
+        compact_expiry_heap()
+
+def compact_expiry_heap():
+    MEME_CACHE_EXPIRY_HEAP[:] = [
+        (expiry, next(_cache_seq), key) for key, (_, expiry) in MEME_CACHE.items()
+    ]
+    heapq.heapify(MEME_CACHE_EXPIRY_HEAP)
+
+def cleanup_cache(now=None):
+    """
+    Evict expired entries from MEME_CACHE and return how many were removed.
+    Runs in O(k log n) for k expired entries instead of scanning the cache.
+    """
+    now = now or datetime.utcnow()
+    removed = 0
+    while MEME_CACHE_EXPIRY_HEAP and MEME_CACHE_EXPIRY_HEAP[0][0] <= now:
+        expiry, _, key = heapq.heappop(MEME_CACHE_EXPIRY_HEAP)
+        entry = MEME_CACHE.get(key)
+        # Skip heap records for keys that were re-cached or already evicted
+        if entry is not None and entry[1] == expiry:
+            del MEME_CACHE[key]
+            removed += 1
+    return removed
 
 def migrate_plaintext_tokens():
     """
@@ -1,11 +1,12 @@
 import os
 import logging
+import signal
+import threading
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
 from supabase import create_client
 from dotenv import load_dotenv
 import schedule
-import time
 
 # Load environment variables
 load_dotenv("config/.env")
@@ -19,29 +20,43 @@ logger = logging.getLogger(__name__)
 # Supabase client
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Max user ids per bulk update request; the id list travels in the URL
+UPDATE_CHUNK_SIZE = 100
+
+# Longest the scheduler sleeps before re-checking for due jobs
+SCHEDULER_MAX_IDLE_SECONDS = 60
+
+# Set to stop run_scheduler (e.g. from the SIGTERM handler)
+shutdown = threading.Event()
+
 def log_job(job_name, status, payload=None, error_message=None):
     entry = {
         "job_name": job_name,
         "status": status,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "payload": payload or {},
         "error_message": error_message
     }
     try:
         supabase.table("job_logs").insert(entry).execute()
-        logger.info(f"Job log written for {job_name}, status: {status}")
+        logger.info("Job log written for %s, status: %s", job_name, status)
     except Exception as e:
-        logger.error(f"Could not log job {job_name}: {e}")
+        logger.error("Could not log job %s: %s", job_name, e)
 
 def daily_refresh():
     job_name = "daily_refresh"
     try:
         users = supabase.table("users").select("id").execute().data
-        for user in users:
-            # Dummy score recalculation – replace with your real logic
-            user_id = user["id"]
-            new_score = 100  # Replace with actual score calculation
-            supabase.table("users").update({"behavior_score": new_score}).eq("id", user_id).execute()
+        # Stamp the whole batch with a single clock read
+        now_iso = datetime.now(timezone.utc).isoformat()
+        user_ids = [user["id"] for user in users]
+        # Dummy score recalculation – replace with your real logic
+        new_score = 100  # Replace with actual score calculation
+        # One update per chunk of ids instead of one round-trip per user. An
+        # update (not upsert) never re-creates users deleted since the select.
+        for start in range(0, len(user_ids), UPDATE_CHUNK_SIZE):
+            chunk_ids = user_ids[start:start + UPDATE_CHUNK_SIZE]
+            supabase.table("users").update({"behavior_score": new_score, "last_updated": now_iso}).in_("id", chunk_ids).execute()
         log_job(job_name, "success", payload={"affected_users": len(users)})
     except Exception as e:
         tb = traceback.format_exc()
@@ -61,9 +76,10 @@ def hourly_anomaly_scan():
     job_name = "hourly_anomaly_scan"
     try:
         # Query recent anomalies in user_risk_flags from the last hour
-        since = datetime.utcnow().isoformat()[:13]  # Get current UTC hour
-        flags = supabase.table("user_risk_flags").select("*").gte("timestamp", since).execute().data
-        log_job(job_name, "success", payload={"anomaly_count": len(flags)})
+        since = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H")  # Get current UTC hour
+        # Let Postgres count the rows (HEAD + exact count) instead of shipping them
+        resp = supabase.table("user_risk_flags").select("id", count="exact", head=True).gte("timestamp", since).execute()
+        log_job(job_name, "success", payload={"anomaly_count": resp.count or 0})
     except Exception as e:
         tb = traceback.format_exc()
         log_job(job_name, "error", error_message=f"{str(e)}\n{tb}")
@@ -76,9 +92,19 @@ def run_scheduler():
 
     logger.info("Scheduled tasks started. Press Ctrl+C to exit.")
 
-    while True:
+    while not shutdown.is_set():
         schedule.run_pending()
-        time.sleep(10)
+        # Sleep until the next job is due instead of polling on a fixed interval
+        idle = schedule.idle_seconds()
+        wait = SCHEDULER_MAX_IDLE_SECONDS if idle is None else min(max(idle, 0), SCHEDULER_MAX_IDLE_SECONDS)
+        shutdown.wait(wait)
+
+    logger.info("Scheduler stopped.")
+
+def handle_sigterm(signum, frame):
+    logger.info("Received signal %s, shutting down scheduler.", signum)
+    shutdown.set()
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, handle_sigterm)
     run_scheduler()
@@ -1,9 +1,10 @@
 import logging
-from datetime import datetime
 
 def track_token_usage(supabase, user_id: str, tokens_used: int = 1, action: str = "generic_action"):
     """
     Tracks token usage for a user by updating cumulative usage and inserting a history record.
+    Both writes happen in one round-trip through the `track_token_usage` Postgres
+    function (see README), which also avoids the read-then-write race on token_used.
     
     :param supabase: Supabase client instance
     :param user_id: ID of the user
@@ -11,27 +12,17 @@ def track_token_usage(supabase, user_id: str, tokens_used: int = 1, action: str
     :param action: Description of the action performed
     """
     try:
-        # Get current total tokens used
-        resp = supabase.table("users").select("token_used").eq("id", user_id).single().execute()
-        prev_total = 0
-        if resp.data:
-            prev_total = resp.data.get("token_used", 0) or 0
-        else:
-            logging.warning(f"track_token_usage: User {user_id} not found.")
-
-        new_total = prev_total + tokens_used
-
-        # Update cumulative token usage in users table
-        supabase.table("users").update({"token_used": new_total}).eq("id", user_id).execute()
-
-        # Insert detailed token usage event
-        supabase.table("token_usage_history").insert({
-            "user_id": user_id,
-            "tokens_used": tokens_used,
-            "action": action,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+        resp = supabase.rpc("track_token_usage", {
+            "p_user_id": user_id,
+            "p_tokens_used": tokens_used,
+            "p_action": action
         }).execute()
 
+        # The function returns false when no users row matched
+        if resp.data is False:
+            logging.warning(f"track_token_usage: User {user_id} not found.")
+            return
+
         logging.info(f"Token usage updated: user={user_id}, tokens_used={tokens_used}, action={action}")
 
     except Exception as e:
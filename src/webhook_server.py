@@ -2,6 +2,7 @@ from flask import Flask, request, jsonify
 from supabase import create_client
 import os
 import logging
+import orjson
 from flask_cors import CORS
 from dotenv import load_dotenv
 from datetime import datetime
@@ -36,7 +37,7 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 @limiter.limit("100 per hour")  # Optional: customize limit per route
 def handle_webhook():
     try:
-        data = request.get_json(force=True)
+        data = orjson.loads(request.get_data())
         logger.info(f"Received webhook data: {data}")
 
         # Validate required fields and types
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeQuery:
+    """
+    Minimal stand-in for a postgrest query builder backed by FakeSupabase's
+    in-memory tables. Supports the filters and writes used by src/.
+    """
+
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._operation = "select"
+        self._values = None
+        self._on_conflict = "id"
+        self._filters = []
+        self._order = None
+        self._limit = None
+        self._single = False
+        self._count = None
+        self._head = False
+
+    def select(self, *columns, count=None, head=None):
+        self._count = count
+        self._head = bool(head)
+        return self
+
+    def insert(self, values):
+        self._operation, self._values = "insert", values
+        return self
+
+    def update(self, values):
+        self._operation, self._values = "update", values
+        return self
+
+    def upsert(self, values, on_conflict="id"):
+        self._operation, self._values, self._on_conflict = "upsert", values, on_conflict
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def execute(self):
+        self._client.calls.append((self._table, self._operation))
+        if self._client.error is not None:
+            raise self._client.error
+
+        rows = self._client.tables[self._table]
+        if self._operation == "insert":
+            new_rows = [dict(r) for r in _as_list(self._values)]
+            rows.extend(new_rows)
+            return SimpleNamespace(data=new_rows, count=None)
+        if self._operation == "upsert":
+            new_rows = [dict(r) for r in _as_list(self._values)]
+            for new_row in new_rows:
+                key = new_row.get(self._on_conflict)
+                existing = next((r for r in rows if r.get(self._on_conflict) == key), None)
+                if existing is None:
+                    rows.append(new_row)
+                else:
+                    existing.update(new_row)
+            return SimpleNamespace(data=new_rows, count=None)
+
+        matched = [r for r in rows if all(f(r) for f in self._filters)]
+        if self._operation == "update":
+            for row in matched:
+                row.update(self._values)
+            return SimpleNamespace(data=[dict(r) for r in matched], count=None)
+
+        if self._order is not None:
+            column, desc = self._order
+            matched = sorted(matched, key=lambda r: r.get(column), reverse=desc)
+        if self._limit is not None:
+            matched = matched[:self._limit]
+        count = len(matched) if self._count else None
+        if self._head:
+            return SimpleNamespace(data=[], count=count)
+        if self._single:
+            return SimpleNamespace(data=dict(matched[0]) if matched else None, count=count)
+        return SimpleNamespace(data=[dict(r) for r in matched], count=count)
+
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self._client = client
+        self._name = name
+        self._params = params
+
+    def execute(self):
+        self._client.rpc_calls.append((self._name, self._params))
+        if self._client.error is not None:
+            raise self._client.error
+        return SimpleNamespace(data=self._client.rpc_results.get(self._name))
+
+
+class FakeSupabase:
+    """
+    Dict-backed Supabase client for unit tests. Seed rows with seed(), inspect
+    writes through `tables`, and count round-trips through `calls`.
+    Set `error` to make every execute() raise.
+    """
+
+    def __init__(self):
+        self.tables = defaultdict(list)
+        self.calls = []  # (table, operation) per executed query
+        self.rpc_calls = []  # (function name, params) per executed RPC
+        self.rpc_results = {}
+        self.error = None
+
+    def seed(self, table, rows):
+        self.tables[table].extend(dict(r) for r in rows)
+        return self
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeRpc(self, name, params or {})
+
+    def call_count(self, table, operation):
+        return self.calls.count((table, operation))
+
+
+def _as_list(values):
+    return values if isinstance(values, list) else [values]
+
+
+@pytest.fixture
+def fake_supabase_factory():
+    """Build additional, independent FakeSupabase clients within one test."""
+    return FakeSupabase
+
+
+@pytest.fixture
+def supabase(fake_supabase_factory):
+    return fake_supabase_factory()
@@ -0,0 +1,125 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch
+# Add the src directory to sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import agk
+from agk import validate_access
+
+
+@pytest.fixture(autouse=True)
+def clear_access_cache():
+    agk._access_cache.clear()
+    yield
+    agk._access_cache.clear()
+
+
+@pytest.fixture
+def default_client(supabase):
+    # Route the default client to the fake so the cached path is exercised
+    with patch.object(agk, "get_supabase", return_value=supabase):
+        yield supabase
+
+
+def user_row(user_id="test_user", behavior_score=80, role="user"):
+    return {"id": user_id, "behavior_score": behavior_score, "role": role, "is_anonymous": False}
+
+
+@pytest.mark.parametrize("rows,expected", [
+    ([user_row(behavior_score=75)], True),
+    ([user_row(behavior_score=60)], True),
+    ([user_row(behavior_score=45)], False),
+    ([user_row(user_id="someone_else")], False),
+])
+def test_validate_access(supabase, rows, expected):
+    supabase.seed("users", rows)
+    assert validate_access("test_user", supabase_client=supabase) is expected
+
+
+def test_validate_access_db_error(supabase):
+    supabase.error = Exception("db down")
+    assert validate_access("test_user", supabase_client=supabase) is False
+
+
+def test_validate_access_caches_grants(default_client):
+    default_client.seed("users", [user_row()])
+
+    assert validate_access("test_user")
+    assert validate_access("test_user")
+    assert default_client.call_count("users", "select") == 1
+
+
+def test_validate_access_does_not_cache_denials(default_client):
+    default_client.seed("users", [user_row(behavior_score=40)])
+
+    assert validate_access("test_user") is False
+    assert validate_access("test_user") is False
+    assert default_client.call_count("users", "select") == 2
+
+
+def test_validate_access_cache_expires(default_client):
+    default_client.seed("users", [user_row()])
+
+    with patch.object(agk.time, "monotonic", side_effect=[0.0, agk.ACCESS_CACHE_TTL_SECONDS + 1]):
+        validate_access("test_user")
+        validate_access("test_user")
+
+    assert default_client.call_count("users", "select") == 2
+
+
+def test_validate_access_cache_disabled(default_client):
+    default_client.seed("users", [user_row()])
+
+    with patch.object(agk, "ACCESS_CACHE_TTL_SECONDS", 0):
+        assert validate_access("test_user")
+        assert validate_access("test_user")
+
+    assert default_client.call_count("users", "select") == 2
+
+
+def test_validate_access_does_not_cache_missing_user(default_client):
+    validate_access("ghost")
+    validate_access("ghost")
+    assert default_client.call_count("users", "select") == 2
+
+
+def test_explicit_client_bypasses_cache(default_client, fake_supabase_factory):
+    default_client.seed("users", [user_row(behavior_score=90)])
+    assert validate_access("test_user")
+
+    # A different client (e.g. anon under RLS) must not reuse the cached grant
+    other_client = fake_supabase_factory()
+    other_client.seed("users", [user_row(behavior_score=40)])
+    assert validate_access("test_user", supabase_client=other_client) is False
+    assert validate_access("test_user", supabase_client=other_client) is False
+    assert other_client.call_count("users", "select") == 2
+    assert list(agk._access_cache) == ["test_user"]
+
+
+def test_supabase_client_created_lazily_once(supabase):
+    supabase.seed("users", [user_row("user_a", 90), user_row("user_b", 90)])
+    agk.get_supabase.cache_clear()
+    try:
+        with patch.object(agk, "create_client", return_value=supabase) as create_client_mock:
+            assert validate_access("user_a")
+            assert validate_access("user_b")
+        assert create_client_mock.call_count == 1
+    finally:
+        agk.get_supabase.cache_clear()
+
+
+def test_module_supabase_attribute_is_shared_client(supabase):
+    agk.get_supabase.cache_clear()
+    try:
+        with patch.object(agk, "create_client", return_value=supabase) as create_client_mock:
+            assert agk.supabase is supabase
+            assert agk.supabase is agk.get_supabase()
+        assert create_client_mock.call_count == 1
+    finally:
+        agk.get_supabase.cache_clear()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,83 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch
+# Add the src directory to sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import analytics
+
+
+def test_fetch_analytics_data(supabase):
+    supabase.seed("users", [{"id": "u1", "behavior_score": 80}])
+    supabase.seed("user_risk_flags", [{"user_id": "u1", "flag": "red", "timestamp": "2025-07-25T00:00:00Z"}])
+
+    with patch.object(analytics, "supabase", supabase):
+        data = analytics.fetch_analytics_data()
+
+    assert data["scores"] == [{"id": "u1", "behavior_score": 80}]
+    assert data["flags"][0]["flag"] == "red"
+
+
+def test_fetch_analytics_data_failure(supabase):
+    supabase.error = Exception("db down")
+
+    with patch.object(analytics, "supabase", supabase):
+        data = analytics.fetch_analytics_data()
+
+    assert data == {"scores": [], "flags": []}
+
+
+def test_prepare_chart_data_score_distribution():
+    data = {
+        "scores": [{"behavior_score": 85}, {"behavior_score": 40}, {"behavior_score": 85}, {"id": "no_score"}, {"behavior_score": None}],
+        "flags": [],
+    }
+    chart_data = analytics.prepare_chart_data(data)
+
+    assert chart_data["score_dist"] == {40: 1, 85: 2}
+    assert list(chart_data["score_dist"]) == [40, 85]
+    assert all(type(k) is int and type(v) is int for k, v in chart_data["score_dist"].items())
+    assert chart_data["flag_trends"] == {}
+
+
+def test_prepare_chart_data_mixed_score_types():
+    data = {
+        "scores": [{"behavior_score": 85}, {"behavior_score": 72.5}, {"behavior_score": "85"}, {"behavior_score": True}, {"behavior_score": 85}],
+    }
+    score_dist = analytics.prepare_chart_data(data)["score_dist"]
+
+    # Floats are kept as-is (not truncated) and non-numeric scores are skipped
+    assert score_dist == {72.5: 1, 85.0: 2}
+
+
+def test_prepare_chart_data_empty():
+    chart_data = analytics.prepare_chart_data({})
+    assert chart_data == {"score_dist": {}, "flag_trends": {}}
+
+
+def test_prepare_chart_data_flag_trends_skips_bad_timestamps():
+    data = {
+        "scores": [],
+        "flags": [
+            {"user_id": "u1", "flag": "red", "timestamp": "2025-07-25T10:00:00Z"},
+            {"user_id": "u2", "flag": "red", "timestamp": "2025-07-25T11:30:00+02:00"},
+            {"user_id": "u3", "flag": "yellow", "timestamp": "2025-07-26T09:00:00Z"},
+            {"user_id": "u4", "flag": "red", "timestamp": "not-a-date"},
+            {"user_id": "u5", "flag": "red", "timestamp": None},
+        ],
+    }
+    trends = analytics.prepare_chart_data(data)["flag_trends"]
+
+    assert len(trends["timestamp"]) == 2
+    assert trends["red"] == [2, 0]
+    assert trends["yellow"] == [0, 1]
+
+
+def test_prepare_chart_data_all_bad_timestamps():
+    data = {"flags": [{"user_id": "u1", "flag": "red", "timestamp": "garbage"}]}
+    assert analytics.prepare_chart_data(data)["flag_trends"] == {}
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -1,7 +1,10 @@
 import sys
 import os
+import json
+from unittest.mock import MagicMock, patch
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from bse import calculate_score
+import bse
+from bse import calculate_score, calculate_score_bits, flags_from_bits, FLAG_BITS, FLAG_NAMES, MASK_PENALTIES, MASK_FLAGS
 
 def test_calculate_score_login_high():
     payload = {
@@ -17,4 +20,89 @@ def test_calculate_score_bad_payload():
     assert score == 100
     assert flags == []
 
+def test_calculate_score_fake_referral():
+    payload = {
+        "event_type": "referral",
+        "metadata": {"ip": "192.168.1.1", "activity": False}
+    }
+    score, flags = calculate_score(payload)
+    assert score == 80
+    assert flags == ["fake_referral"]
+
+def test_calculate_score_rapid_clicks():
+    payload = {
+        "event_type": "click",
+        "metadata": {"click_rate": 35, "login_count": 50}
+    }
+    score, flags = calculate_score(payload)
+    assert score == 85
+    assert flags == ["rapid_clicks"]
+
+def test_calculate_score_thresholds_not_exceeded():
+    payload = {
+        "event_type": "login",
+        "metadata": {"login_count": 10}
+    }
+    assert calculate_score(payload) == (100, [])
+
+def test_calculate_score_unknown_event():
+    payload = {
+        "event_type": "logout",
+        "metadata": {"login_count": 50, "click_rate": 99}
+    }
+    assert calculate_score(payload) == (100, [])
+
+def test_calculate_score_invalid_payload_types():
+    assert calculate_score(None) == (100, [])
+    assert calculate_score("login") == (100, [])
+    assert calculate_score({"event_type": "login", "metadata": "login_count=12"}) == (100, [])
+
+def test_calculate_score_bits():
+    payload = {
+        "event_type": "click",
+        "metadata": {"click_rate": 35}
+    }
+    score, flag_bits = calculate_score_bits(payload)
+    assert score == 85
+    assert flag_bits == FLAG_BITS["rapid_clicks"]
+    assert flags_from_bits(flag_bits) == ["rapid_clicks"]
+    assert calculate_score_bits({}) == (100, 0)
+
+def test_calculate_score_empty_metadata():
+    assert calculate_score({"event_type": "login", "metadata": {}}) == (100, [])
+    assert calculate_score({"event_type": "login", "metadata": None}) == (100, [])
+    assert calculate_score({"event_type": "click"}) == (100, [])
+
+def test_send_score_to_webhook_uses_shared_session():
+    with patch.object(bse.webhook_session, "post", return_value=MagicMock(status_code=200)) as post_mock:
+        bse.send_score_to_webhook("abc123", 90, ["frequent_logins"])
+        bse.send_score_to_webhook("abc124", 80, [])
+
+    assert post_mock.call_count == 2
+    kwargs = post_mock.call_args_list[0][1]
+    assert kwargs["headers"]["Content-Type"] == "application/json"
+    assert kwargs["timeout"] == bse.WEBHOOK_TIMEOUT
+    sent = json.loads(kwargs["data"])
+    assert sent["user_id"] == "abc123"
+    assert sent["behavior_score"] == 90
+    assert sent["risk_flags"] == ["frequent_logins"]
+    assert sent["timestamp"].endswith("Z")
+
+def test_mask_penalties_cover_every_flag_combination():
+    assert len(MASK_PENALTIES) == 1 << len(FLAG_NAMES)
+    assert MASK_PENALTIES[0] == 0
+    all_flags = sum(FLAG_BITS.values())
+    assert MASK_PENALTIES[all_flags] == 45
+    assert flags_from_bits(all_flags) == list(FLAG_NAMES)
+    assert len(MASK_FLAGS) == len(MASK_PENALTIES)
+    assert MASK_FLAGS[FLAG_BITS["fake_referral"]] == ("fake_referral",)
+
+def test_send_scores_bulk():
+    responses = {"ok_user": MagicMock(status_code=200), "bad_user": MagicMock(status_code=500, text="boom")}
+    with patch.object(bse.webhook_session, "post", side_effect=lambda url, data, headers, timeout: responses[json.loads(data)["user_id"]]) as post_mock:
+        results = bse.send_scores_bulk([("ok_user", 90, []), ("bad_user", 40, ["rapid_clicks"])])
+
+    assert results == [True, False]
+    assert post_mock.call_count == 2
+
 # Add more edge and valid cases as needed.
@@ -0,0 +1,78 @@
+import sys
+import os
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+# Add the src directory to sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault("TOKEN_ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+import meme_gen
+
+
+@pytest.fixture(autouse=True)
+def clear_meme_cache():
+    meme_gen.MEME_CACHE.clear()
+    meme_gen.MEME_CACHE_EXPIRY_HEAP.clear()
+    yield
+    meme_gen.MEME_CACHE.clear()
+    meme_gen.MEME_CACHE_EXPIRY_HEAP.clear()
+
+
+def test_cache_roundtrip():
+    meme_gen.cache_result("u1", "AI vs Humans", "sarcastic", None, {"id": "m1"})
+    assert meme_gen.get_cached_result("u1", "AI vs Humans", "sarcastic", None) == {"id": "m1"}
+    assert meme_gen.get_cached_result("u1", "AI vs Humans", "wholesome", None) is None
+
+
+def test_cleanup_cache_removes_only_expired():
+    meme_gen.cache_result("u1", "short", "funny", None, {"id": "m1"}, ttl_hours=1)
+    meme_gen.cache_result("u2", "long", "funny", None, {"id": "m2"}, ttl_hours=48)
+
+    removed = meme_gen.cleanup_cache(datetime.utcnow() + timedelta(hours=2))
+
+    assert removed == 1
+    assert ("u1", "short", "funny", "") not in meme_gen.MEME_CACHE
+    assert ("u2", "long", "funny", "") in meme_gen.MEME_CACHE
+
+
+def test_cleanup_cache_ignores_superseded_entries():
+    meme_gen.cache_result("u1", "p", "funny", None, {"id": "old"}, ttl_hours=1)
+    meme_gen.cache_result("u1", "p", "funny", None, {"id": "new"}, ttl_hours=48)
+
+    assert meme_gen.cleanup_cache(datetime.utcnow() + timedelta(hours=2)) == 0
+    assert meme_gen.get_cached_result("u1", "p", "funny", None) == {"id": "new"}
+
+
+def test_cache_size_limit_evicts_least_recently_used():
+    with patch.object(meme_gen, "CACHE_MAX_SIZE", 2):
+        meme_gen.cache_result("u1", "a", "funny", None, {"id": "a"})
+        meme_gen.cache_result("u1", "b", "funny", None, {"id": "b"})
+        # Touch "a" so "b" becomes the least recently used entry
+        assert meme_gen.get_cached_result("u1", "a", "funny", None) == {"id": "a"}
+        meme_gen.cache_result("u1", "c", "funny", None, {"id": "c"})
+
+    assert len(meme_gen.MEME_CACHE) == 2
+    assert meme_gen.get_cached_result("u1", "b", "funny", None) is None
+    assert meme_gen.get_cached_result("u1", "a", "funny", None) == {"id": "a"}
+
+
+def test_expiry_heap_stays_bounded_under_churn():
+    with patch.object(meme_gen, "CACHE_MAX_SIZE", 2):
+        for i in range(1000):
+            meme_gen.cache_result("u1", f"prompt {i}", "funny", None, {"id": i})
+        for i in range(1000):
+            meme_gen.cache_result("u1", "same", "funny", None, {"id": i})
+
+        assert len(meme_gen.MEME_CACHE) == 2
+        assert len(meme_gen.MEME_CACHE_EXPIRY_HEAP) <= 2 * meme_gen.CACHE_MAX_SIZE
+
+    assert meme_gen.get_cached_result("u1", "same", "funny", None) == {"id": 999}
+    # Live entries still expire through the compacted heap
+    assert meme_gen.cleanup_cache(datetime.utcnow() + timedelta(hours=25)) == 2
+    assert not meme_gen.MEME_CACHE
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,96 @@
+import sys
+import os
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+# Add the src directory to sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import sol
+
+
+def test_daily_refresh_single_update(supabase):
+    supabase.seed("users", [{"id": "u1", "behavior_score": 40}, {"id": "u2", "behavior_score": 70}])
+
+    with patch.object(sol, "supabase", supabase), patch.object(sol, "log_job") as log_job_mock:
+        sol.daily_refresh()
+
+    # All users written in one bulk update, no upsert
+    assert supabase.call_count("users", "update") == 1
+    assert supabase.call_count("users", "upsert") == 0
+    rows = supabase.tables["users"]
+    assert [r["behavior_score"] for r in rows] == [100, 100]
+    assert rows[0]["last_updated"] == rows[1]["last_updated"]
+    log_job_mock.assert_called_with("daily_refresh", "success", payload={"affected_users": 2})
+
+
+def test_daily_refresh_chunks_large_batches(supabase):
+    supabase.seed("users", [{"id": f"u{i}"} for i in range(sol.UPDATE_CHUNK_SIZE + 1)])
+
+    with patch.object(sol, "supabase", supabase), patch.object(sol, "log_job"):
+        sol.daily_refresh()
+
+    assert supabase.call_count("users", "update") == 2
+    assert all(r["behavior_score"] == 100 for r in supabase.tables["users"])
+
+
+def test_daily_refresh_does_not_recreate_deleted_users(supabase):
+    # u2 was deleted after the select returned it
+    supabase.seed("users", [{"id": "u1"}])
+    stale_select = MagicMock()
+    stale_select.select.return_value.execute.return_value = SimpleNamespace(data=[{"id": "u1"}, {"id": "u2"}])
+
+    with patch.object(sol, "supabase", supabase), patch.object(sol, "log_job"), \
+            patch.object(supabase, "table", side_effect=[stale_select, supabase.table("users")]):
+        sol.daily_refresh()
+
+    rows = supabase.tables["users"]
+    assert [r["id"] for r in rows] == ["u1"]
+    assert rows[0]["behavior_score"] == 100
+
+
+def test_hourly_anomaly_scan_counts_server_side(supabase):
+    now = datetime.now(timezone.utc)
+    supabase.seed("user_risk_flags", [
+        {"id": 1, "timestamp": now.isoformat()},
+        {"id": 2, "timestamp": now.isoformat()},
+        {"id": 3, "timestamp": (now - timedelta(days=1)).isoformat()},
+    ])
+
+    with patch.object(sol, "supabase", supabase), patch.object(sol, "log_job") as log_job_mock:
+        sol.hourly_anomaly_scan()
+
+    log_job_mock.assert_called_with("hourly_anomaly_scan", "success", payload={"anomaly_count": 2})
+
+
+def test_hourly_anomaly_scan_logs_errors(supabase):
+    supabase.error = Exception("db down")
+
+    with patch.object(sol, "supabase", supabase), patch.object(sol, "log_job") as log_job_mock:
+        sol.hourly_anomaly_scan()
+
+    assert log_job_mock.call_args[0][:2] == ("hourly_anomaly_scan", "error")
+
+
+def test_run_scheduler_waits_for_next_job_and_stops_on_shutdown():
+    waits = []
+
+    def fake_wait(timeout):
+        waits.append(timeout)
+        sol.shutdown.set()
+
+    try:
+        with patch.object(sol.shutdown, "wait", side_effect=fake_wait), \
+                patch.object(sol.schedule, "run_pending") as run_pending_mock:
+            sol.run_scheduler()
+    finally:
+        sol.shutdown.clear()
+        sol.schedule.clear()
+
+    assert run_pending_mock.call_count == 1
+    assert 0 <= waits[0] <= sol.SCHEDULER_MAX_IDLE_SECONDS
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])